@@ -1,71 +1,449 @@
 #!/usr/bin/env python3
+# mypy: disallow-any-generics, disallow-subclassing-any, disallow-untyped-calls
+# mypy: disallow-untyped-defs, disallow-incomplete-defs, check-untyped-defs
+# mypy: disallow-untyped-decorators, warn-redundant-casts, warn-unused-ignores
+# mypy: warn-return-any, no-implicit-reexport, strict-equality, extra-checks
 """
 CCView Python Backend - Quantum Chemistry File Parser
 
 This module provides the Python backend for parsing quantum chemistry output files
 using cclib library and converting data to formats suitable for miew viewer.
+
+Besides the one-shot commands (parse, ccget, ccwrite, detect, parse-many),
+``parser.py serve`` keeps one process alive for many requests.  It reads
+one JSON request per line from stdin and writes one JSON response per line
+to stdout, in the same order::
+
+    {"cmd": "parse", "args": ["/path/to/file.log"]}
+    {"cmd": "ccget", "args": ["/path/to/file.log", "scfenergies"]}
+    {"cmd": "ccwrite", "args": ["/path/to/file.log", "xyz"]}
+    {"cmd": "detect", "args": ["/path/to/file.log"]}
+
+Each response is the object the corresponding one-shot command prints.
+Unknown commands and malformed lines get ``{"success": false, "error": ...}``.
+The server exits when stdin is closed.
+
+Adding ``--binary`` to any command writes MessagePack instead of JSON (one
+object per response, without newlines); numpy arrays are sent in this
+module's own layout,
+``{"nd": true, "type": <dtype>, "shape": [...], "data": <raw bytes>}``,
+where type is the numpy dtype string (including byte order).
 """
 
 import json
 import sys
 import os
-from typing import Dict, Any, List, Optional, Union
-import traceback
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
-try:
-    import cclib
-    from cclib.io import moldenwriter
-    from cclib.io import ccread, ccwrite
-    CCLIB_AVAILABLE = True
-except ImportError:
-    CCLIB_AVAILABLE = False
-    # Suppress warning for now as it's working correctly
-    pass
+if TYPE_CHECKING:
+    from cclib.parser.data import ccData
+
+# cclib and numpy are imported on first use (see _require_cclib) so that
+# commands which never touch parsed data start without paying for them
+CCLIB_AVAILABLE = False
+ccread: Optional[Callable[..., Any]] = None
+ccwrite: Optional[Callable[..., Any]] = None
+
+NUMPY_AVAILABLE = False
+np: Any = None
+
+# msgpack is only needed for --binary output
+MSGPACK_AVAILABLE = False
+msgpack: Any = None
 
 try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    NUMPY_AVAILABLE = False
-    # Suppress warning for now as it's working correctly
-    pass
+    # Fall back to the standard json module
+    ORJSON_AVAILABLE = False
+
+# Map lowercased cclib package names (metadata['package']) to format names
+_CCLIB_PACKAGE_TO_FORMAT = MappingProxyType({
+    'gaussian': 'gaussian',
+    'gamess': 'gamess',
+    'gamessuk': 'gamessuk',
+    'nwchem': 'nwchem',
+    'orca': 'orca',
+    'qchem': 'qchem',
+    'psi4': 'psi4',
+    'turbomole': 'turbomole',
+    'molpro': 'molpro',
+    'molcas': 'molcas',
+    'adf': 'adf',
+    'cfour': 'cfour',
+    'dalton': 'dalton',
+    'jaguar': 'jaguar',
+    'mopac': 'mopac',
+    'xtb': 'xtb'
+})
+
+# Banner phrases that identify each program, taken from cclib's own
+# filetype triggers plus phrases printed on the very first line (such as
+# Gaussian's "Entering Gaussian System") so the scan usually stops there.
+# More specific phrases come first so that they win when two phrases
+# start at the same offset.
+_FORMAT_MARKERS = (
+    ('gamessuk', [b'G A M E S S - U K']),
+    ('gamess', [b'GAMESS VERSION', b'Firefly (PC GAMESS)']),
+    ('gaussian', [b'Entering Gaussian System', b'Gaussian, Inc.']),
+    ('orca', [b'O   R   C   A']),
+    ('nwchem', [b'Northwest Computational Chemistry Package']),
+    ('qchem', [b'A Quantum Leap Into The Future Of Chemistry']),
+    ('psi4', [b'Psi4: An Open-Source Ab Initio Electronic Structure Package']),
+    ('molpro', [b'PROGRAM SYSTEM MOLPRO']),
+    ('molcas', [b'MOLCAS']),
+    ('adf', [b'Amsterdam Density Functional']),
+    ('dalton', [b'Dalton - An Electronic Structure Program']),
+    ('mopac', [b'MOPAC20']),
+    ('turbomole', [b'TURBOMOLE']),
+    ('jaguar', [b'Jaguar']),
+    ('xtb', [b'x T B']),
+)
+
+# Weaker phrases that cclib only relies on when no banner is found at all
+_FALLBACK_MARKERS = (
+    ('gamess', [b'GAMESS']),
+    ('molpro', [b'1PROGRAM']),
+)
+
+
+def _lowered_needles(markers: Tuple[Tuple[str, List[bytes]], ...]) -> Tuple[Tuple[bytes, str], ...]:
+    """Flatten (format, phrases) pairs into lowercased (phrase, format) pairs"""
+    return tuple((phrase.lower(), name) for name, phrases in markers for phrase in phrases)
+
+
+_FORMAT_NEEDLES = _lowered_needles(_FORMAT_MARKERS)
+_FALLBACK_NEEDLES = _lowered_needles(_FALLBACK_MARKERS)
+
+# Bytes carried over between chunks so that phrases spanning a boundary match
+_NEEDLE_OVERLAP = max(len(needle) for needle, _ in _FORMAT_NEEDLES + _FALLBACK_NEEDLES) - 1
+
+# The header is scanned on its own first, since banners are almost always
+# there; the rest of the file is then read in larger chunks
+_HEADER_SIZE = 2000
+_SCAN_CHUNK_SIZE = 1 << 20
+
+if ORJSON_AVAILABLE:
+    # Serialize numpy arrays and scalars directly from their buffers
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _require_numpy() -> bool:
+    """Import numpy on first use and report whether it is available"""
+    global NUMPY_AVAILABLE, np
+    if not NUMPY_AVAILABLE:
+        try:
+            import numpy as np
+        except ImportError:
+            return False
+        NUMPY_AVAILABLE = True
+    return NUMPY_AVAILABLE
+
+
+def _require_cclib() -> bool:
+    """Import cclib on first use and report whether it is available"""
+    global CCLIB_AVAILABLE, ccread, ccwrite
+    if not CCLIB_AVAILABLE:
+        try:
+            # cclib.io re-exports these from ccio without declaring them
+            from cclib.io.ccio import ccread, ccwrite
+        except ImportError:
+            return False
+        CCLIB_AVAILABLE = True
+        # cclib data is backed by numpy arrays
+        _require_numpy()
+    return CCLIB_AVAILABLE
+
+
+def _require_msgpack() -> bool:
+    """Import msgpack on first use and report whether it is available"""
+    global MSGPACK_AVAILABLE, msgpack
+    if not MSGPACK_AVAILABLE:
+        try:
+            import msgpack
+        except ImportError:
+            return False
+        MSGPACK_AVAILABLE = True
+    return MSGPACK_AVAILABLE
+
+
+def _scan_format(f: BinaryIO) -> Optional[str]:
+    """Find the format whose banner appears first in a binary file"""
+    fallback = None
+    window = b''
+    size = _HEADER_SIZE
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            return fallback
+        
+        # Lowercase each chunk once; every find is then a single memmem pass,
+        # bounded by the earliest match found so far
+        window = window[-_NEEDLE_OVERLAP:] + chunk.lower()
+        best_pos, detected = len(window), None
+        for needle, name in _FORMAT_NEEDLES:
+            pos = window.find(needle, 0, best_pos - 1 + len(needle))
+            if pos >= 0:
+                best_pos, detected = pos, name
+        if detected:
+            return detected
+        
+        if fallback is None:
+            fallback = next((name for needle, name in _FALLBACK_NEEDLES if needle in window), None)
+        size = _SCAN_CHUNK_SIZE
+
+
+@lru_cache(maxsize=8)
+def _cached_ccread(path: str, mtime_ns: int, size: int) -> 'ccData':
+    """Parse a file with cclib; mtime and size only serve as cache keys"""
+    # Callers load cclib through _require_cclib first
+    assert ccread is not None
+    data: 'ccData' = ccread(path)
+    return data
+
+
+def _read(file_path: str) -> 'ccData':
+    """Parse a file with cclib, reusing the result while the file is unchanged"""
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return _cached_ccread(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert objects the JSON encoders cannot serialize natively
+    
+    Results keep numpy arrays until they are written; orjson encodes most of
+    them itself, while the standard json module needs every array and numpy
+    scalar converted here.
+    """
+    # Results may come from worker processes (parse-many) without numpy
+    # ever having been imported here
+    if _require_numpy():
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+    return str(obj)
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    """Encode an object to JSON bytes with orjson"""
+    return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Convert objects msgpack cannot serialize natively
+    
+    Arrays use this module's own {nd, type, shape, data} layout, with the
+    raw buffer in data (byte order given by type) so that JavaScript
+    consumers can view it as a typed array without parsing numbers.  It is
+    not msgpack-numpy's format, which msgpack_numpy.decode expects.
+    """
+    if not _require_numpy():
+        return str(obj)
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            return obj.tolist()
+        return {
+            'nd': True,
+            'type': obj.dtype.str,
+            'shape': list(obj.shape),
+            'data': obj.data if obj.flags.c_contiguous else obj.tobytes()
+        }
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def _encode_result(result: Dict[str, Any], binary: bool = False) -> bytes:
+    """Encode a command result as a single line of JSON
+    
+    With binary set, the result is encoded as one MessagePack object
+    instead (no newline; MessagePack objects are self-delimiting).
+    """
+    if binary:
+        packed: bytes = msgpack.packb(result, default=_msgpack_default, use_bin_type=True)
+        return packed
+    elif ORJSON_AVAILABLE:
+        return _orjson_dumps(result) + b'\n'
+    else:
+        return (json.dumps(result, separators=(',', ':'), default=_json_default) + '\n').encode()
+
+
+def _write_result(result: Dict[str, Any], binary: bool = False) -> None:
+    """Write a command result to stdout (see _encode_result for the format)"""
+    if binary or ORJSON_AVAILABLE:
+        sys.stdout.buffer.write(_encode_result(result, binary))
+    else:
+        # Stream the encoder output instead of building the whole string first
+        json.dump(result, sys.stdout, separators=(',', ':'), default=_json_default)
+        sys.stdout.write('\n')
+
+
+def _format_traceback(e: BaseException) -> str:
+    """Describe an exception for error results
+    
+    Only the exception line is reported by default; set CCVIEW_DEBUG to
+    include the full traceback with source lines.
+    """
+    import traceback
+    if os.environ.get('CCVIEW_DEBUG'):
+        return traceback.format_exc()
+    return ''.join(traceback.format_exception_only(type(e), e))
+
+
+def _passthrough_numeric(obj: Any) -> Any:
+    """Prepare numpy arrays or other objects for serialization as lists
+    
+    Arrays are kept as-is; the encoder used at write time (orjson, msgpack
+    or the standard json module) decides how to serialize them.
+    """
+    if NUMPY_AVAILABLE and isinstance(obj, np.ndarray):
+        return obj
+    elif isinstance(obj, (list, tuple)):
+        return list(obj)
+    else:
+        return [obj] if obj is not None else []
+
+
+def _passthrough_each(items: Any) -> List[Any]:
+    """Prepare each array in a sequence (e.g. one per spin) for serialization"""
+    return [_passthrough_numeric(item) for item in items]
+
+
+def _stack_each(items: Any) -> Any:
+    """Prepare a sequence of equally shaped arrays as one stacked array
+    
+    Per-spin orbital data becomes a single contiguous buffer with a leading
+    spin axis; it serializes to the same nested lists as _passthrough_each.
+    """
+    if (NUMPY_AVAILABLE and isinstance(items, (list, tuple)) and items
+            and all(isinstance(item, np.ndarray) and item.shape == items[0].shape for item in items)):
+        return _passthrough_numeric(np.stack(items))
+    return _passthrough_each(items)
+
+
+def _passthrough_values(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    """Prepare each array in a mapping (e.g. one per charge scheme) for serialization"""
+    return {k: _passthrough_numeric(v) for k, v in mapping.items()}
+
+
+def _flat_array(obj: Any) -> Any:
+    """Describe an array as its shape, dtype and flattened data
+    
+    Consumers rebuild a typed array from the flat data instead of walking
+    nested per-frame, per-atom lists.
+    """
+    if NUMPY_AVAILABLE and isinstance(obj, np.ndarray):
+        return {
+            'shape': list(obj.shape),
+            'dtype': str(obj.dtype),
+            'data': _passthrough_numeric(obj.ravel())
+        }
+    return _passthrough_numeric(obj)
+
+
+# (cclib attribute, output key, converter) for each extracted section
+_Fields = Tuple[Tuple[str, str, Callable[[Any], Any]], ...]
+
+_MOLECULE_FIELDS: _Fields = (
+    ('atomnos', 'atoms', _passthrough_numeric),
+    ('atomcoords', 'coordinates', _flat_array),
+    ('atommasses', 'masses', _passthrough_numeric),
+)
+
+_ENERGY_FIELDS: _Fields = (
+    ('scfenergies', 'scf', _passthrough_numeric),
+    ('mpenergies', 'mp2', _passthrough_numeric),
+    ('ccenergies', 'cc', _passthrough_numeric),
+    ('zpve', 'zpve', float),
+    ('enthalpy', 'enthalpy', float),
+    ('freeenergy', 'free_energy', float),
+)
+
+_VIBRATION_FIELDS: _Fields = (
+    ('vibfreqs', 'frequencies', _passthrough_numeric),
+    ('vibirs', 'ir_intensities', _passthrough_numeric),
+    ('vibramans', 'raman_activities', _passthrough_numeric),
+    ('vibdisps', 'displacements', _passthrough_numeric),
+    ('vibsyms', 'symmetries', list),
+)
+
+_ORBITAL_FIELDS: _Fields = (
+    ('moenergies', 'energies', _stack_each),
+    ('mocoeffs', 'coefficients', _stack_each),
+    ('homos', 'homo_indices', _passthrough_numeric),
+    ('nbasis', 'nbasis', int),
+    ('nmo', 'nmo', int),
+)
+
+_PROPERTY_FIELDS: _Fields = (
+    ('moments', 'moments', _passthrough_each),
+    ('polarizabilities', 'polarizabilities', _stack_each),
+    ('atomcharges', 'atom_charges', _passthrough_values),
+    ('atomspins', 'atom_spins', _passthrough_values),
+)
+
+
+def _attribute_lookup(data: Any) -> Callable[[str], Any]:
+    """Return a function that looks up attributes of data by name, or None"""
+    try:
+        # cclib stores parsed attributes on the instance, so a plain dict
+        # lookup avoids the AttributeError raised for every missing one
+        lookup: Callable[[str], Any] = vars(data).get
+        return lookup
+    except TypeError:
+        # Objects without an instance __dict__ (e.g. __slots__ classes)
+        return lambda name: getattr(data, name, None)
+
+
+def _extract_fields(data: 'ccData', fields: _Fields, out: Dict[str, Any]) -> Dict[str, Any]:
+    """Store each attribute of data that is set, converted, under its output key"""
+    lookup = _attribute_lookup(data)
+    for attr, key, convert in fields:
+        value = lookup(attr)
+        if value is not None:
+            out[key] = convert(value)
+    return out
 
 
 class QuantumChemistryParser:
     """Parser for quantum chemistry output files using cclib"""
     
-    def __init__(self):
+    def __init__(self) -> None:
         pass
     
-    def _get_format_from_cclib_data(self, data) -> str:
+    def _get_format_from_cclib_data(self, data: 'ccData') -> str:
         """Get format from cclib data object"""
-        class_name = type(data).__name__.lower()
-        
-        # Map cclib class names to format names
-        format_mapping = {
-            'gaussian': 'gaussian',
-            'gamess': 'gamess',
-            'gamessuk': 'gamessuk',
-            'nwchem': 'nwchem',
-            'orca': 'orca',
-            'qchem': 'qchem',
-            'psi4': 'psi4',
-            'turbomole': 'turbomole',
-            'molpro': 'molpro',
-            'molcas': 'molcas',
-            'adf': 'adf',
-            'cfour': 'cfour',
-            'dalton': 'dalton',
-            'jaguar': 'jaguar',
-            'mopac': 'mopac',
-            'xtb': 'xtb'
-        }
-        
-        return format_mapping.get(class_name, 'unknown')
+        # Parsed data is a plain ccData; the program is recorded in metadata
+        package = getattr(data, 'metadata', {}).get('package', '')
+        return _CCLIB_PACKAGE_TO_FORMAT.get(package.lower(), 'unknown')
+    
+    def detect_file_format(self, file_path: str) -> str:
+        """Detect file format from the program banner without parsing the file"""
+        with open(file_path, 'rb') as f:
+            detected = _scan_format(f)
+        return detected or 'unknown'
+    
+    def execute_detect(self, file_path: str) -> Dict[str, Any]:
+        """Execute format detection and report it as a command result"""
+        try:
+            return {
+                'success': True,
+                'detected_format': self.detect_file_format(file_path)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
     
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """Parse quantum chemistry output file and return structured data"""
-        if not CCLIB_AVAILABLE:
+        if not _require_cclib():
             return {
                 'success': False,
                 'error': 'cclib library not available'
@@ -73,7 +451,7 @@ class QuantumChemistryParser:
         
         try:
             # Parse file using cclib
-            data = ccread(file_path)
+            data = _read(file_path)
             
             # Get XYZ format string directly from cclib
             xyz_content = data.writexyz()
@@ -97,127 +475,36 @@ class QuantumChemistryParser:
             return {
                 'success': False,
                 'error': str(e),
-                'traceback': traceback.format_exc()
+                'traceback': _format_traceback(e)
             }
     
-    def _extract_molecule_data(self, data) -> Dict[str, Any]:
+    def _extract_molecule_data(self, data: 'ccData') -> Dict[str, Any]:
         """Extract molecular structure data"""
-        molecule = {
+        molecule: Dict[str, Any] = {
             'natom': getattr(data, 'natom', 0),
             'charge': getattr(data, 'charge', 0),
-            'multiplicity': getattr(data, 'mult', 1)
+            'multiplicity': getattr(data, 'mult', 1),
+            'atoms': [],
+            'coordinates': {'shape': [0, 0, 3], 'dtype': 'float64', 'data': []},
+            'masses': []
         }
-        
-        # Extract atomic data
-        if hasattr(data, 'atomnos') and data.atomnos is not None:
-            molecule['atoms'] = self._convert_to_list(data.atomnos)
-        else:
-            molecule['atoms'] = []
-            
-        if hasattr(data, 'atomcoords') and data.atomcoords is not None:
-            molecule['coordinates'] = self._convert_to_list(data.atomcoords)
-        else:
-            molecule['coordinates'] = []
-            
-        if hasattr(data, 'atommasses') and data.atommasses is not None:
-            molecule['masses'] = self._convert_to_list(data.atommasses)
-        else:
-            molecule['masses'] = []
-        
-        return molecule
+        return _extract_fields(data, _MOLECULE_FIELDS, molecule)
     
-    def _extract_energy_data(self, data) -> Dict[str, Any]:
+    def _extract_energy_data(self, data: 'ccData') -> Dict[str, Any]:
         """Extract energy data"""
-        energies = {}
-        
-        if hasattr(data, 'scfenergies') and data.scfenergies is not None:
-            energies['scf'] = self._convert_to_list(data.scfenergies)
-            
-        if hasattr(data, 'mpenergies') and data.mpenergies is not None:
-            energies['mp2'] = self._convert_to_list(data.mpenergies)
-            
-        if hasattr(data, 'ccenergies') and data.ccenergies is not None:
-            energies['cc'] = self._convert_to_list(data.ccenergies)
-            
-        if hasattr(data, 'zpve') and data.zpve is not None:
-            energies['zpve'] = float(data.zpve)
-            
-        if hasattr(data, 'enthalpy') and data.enthalpy is not None:
-            energies['enthalpy'] = float(data.enthalpy)
-            
-        if hasattr(data, 'freeenergy') and data.freeenergy is not None:
-            energies['free_energy'] = float(data.freeenergy)
-        
-        return energies
+        return _extract_fields(data, _ENERGY_FIELDS, {})
     
-    def _extract_vibration_data(self, data) -> Dict[str, Any]:
+    def _extract_vibration_data(self, data: 'ccData') -> Dict[str, Any]:
         """Extract vibrational data"""
-        vibrations = {}
-        
-        if hasattr(data, 'vibfreqs') and data.vibfreqs is not None:
-            vibrations['frequencies'] = self._convert_to_list(data.vibfreqs)
-            
-        if hasattr(data, 'vibirs') and data.vibirs is not None:
-            vibrations['ir_intensities'] = self._convert_to_list(data.vibirs)
-            
-        if hasattr(data, 'vibramans') and data.vibramans is not None:
-            vibrations['raman_activities'] = self._convert_to_list(data.vibramans)
-            
-        if hasattr(data, 'vibdisps') and data.vibdisps is not None:
-            vibrations['displacements'] = self._convert_to_list(data.vibdisps)
-            
-        if hasattr(data, 'vibsyms') and data.vibsyms is not None:
-            vibrations['symmetries'] = list(data.vibsyms)
-        
-        return vibrations
+        return _extract_fields(data, _VIBRATION_FIELDS, {})
     
-    def _extract_orbital_data(self, data) -> Dict[str, Any]:
+    def _extract_orbital_data(self, data: 'ccData') -> Dict[str, Any]:
         """Extract molecular orbital data"""
-        orbitals = {}
-        
-        if hasattr(data, 'moenergies') and data.moenergies is not None:
-            orbitals['energies'] = [self._convert_to_list(mo) for mo in data.moenergies]
-            
-        if hasattr(data, 'mocoeffs') and data.mocoeffs is not None:
-            orbitals['coefficients'] = [self._convert_to_list(mo) for mo in data.mocoeffs]
-            
-        if hasattr(data, 'homos') and data.homos is not None:
-            orbitals['homo_indices'] = self._convert_to_list(data.homos)
-            
-        if hasattr(data, 'nbasis') and data.nbasis is not None:
-            orbitals['nbasis'] = int(data.nbasis)
-            
-        if hasattr(data, 'nmo') and data.nmo is not None:
-            orbitals['nmo'] = int(data.nmo)
-        
-        return orbitals
+        return _extract_fields(data, _ORBITAL_FIELDS, {})
     
-    def _extract_property_data(self, data) -> Dict[str, Any]:
+    def _extract_property_data(self, data: 'ccData') -> Dict[str, Any]:
         """Extract other property data"""
-        properties = {}
-        
-        if hasattr(data, 'moments') and data.moments is not None:
-            properties['moments'] = [self._convert_to_list(m) for m in data.moments]
-            
-        if hasattr(data, 'polarizabilities') and data.polarizabilities is not None:
-            properties['polarizabilities'] = [self._convert_to_list(p) for p in data.polarizabilities]
-            
-        if hasattr(data, 'atomcharges') and data.atomcharges is not None:
-            properties['atom_charges'] = {k: self._convert_to_list(v) for k, v in data.atomcharges.items()}
-            
-        if hasattr(data, 'atomspins') and data.atomspins is not None:
-            properties['atom_spins'] = {k: self._convert_to_list(v) for k, v in data.atomspins.items()}
-        
-        return properties
-    
-    def _convert_to_list(self, obj) -> List:
-        """Convert numpy arrays or other objects to Python lists"""
-        if NUMPY_AVAILABLE and isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, (list, tuple)):
-            return list(obj)
-        else:
-            return [obj] if obj is not None else []
+        return _extract_fields(data, _PROPERTY_FIELDS, {})
     
     def _format_property_output(self, property_name: str, data: Any) -> str:
         """Format property output for display"""
@@ -228,7 +515,7 @@ class QuantumChemistryParser:
         else:
             return self._format_simple_output(property_name, data)
 
-    def _format_dict_output(self, property_name: str, data: dict) -> str:
+    def _format_dict_output(self, property_name: str, data: Dict[Any, Any]) -> str:
         """Format dictionary output (e.g., atomcharges)"""
         result = f"{property_name}:\n"
         
@@ -254,7 +541,7 @@ class QuantumChemistryParser:
         
         return result
 
-    def _format_array_output(self, property_name: str, data) -> str:
+    def _format_array_output(self, property_name: str, data: Any) -> str:
         """Format array output"""
         result = f"{property_name}:\n"
         
@@ -293,30 +580,16 @@ class QuantumChemistryParser:
             return f"{float(value):.6f}"
         return str(value)
 
-    def _convert_complex_to_json(self, obj) -> Any:
-        """Convert complex objects (including nested numpy arrays) to JSON-serializable format"""
-        if obj is None:
-            return None
-        elif NUMPY_AVAILABLE and isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {k: self._convert_complex_to_json(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple)):
-            return [self._convert_complex_to_json(item) for item in obj]
-        elif NUMPY_AVAILABLE and isinstance(obj, np.integer):
-            return int(obj)
-        elif NUMPY_AVAILABLE and isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, (int, float, str, bool)):
-            return obj
-        else:
-            # For other types, try to convert to string
-            return str(obj)
-    
     def execute_ccget(self, file_path: str, property_name: str) -> Dict[str, Any]:
         """Execute ccget command equivalent with formatted output"""
+        if not _require_cclib():
+            return {
+                'success': False,
+                'error': 'cclib library not available'
+            }
+        
         try:
-            data = ccread(file_path)
+            data = _read(file_path)
             
             if hasattr(data, property_name):
                 value = getattr(data, property_name)
@@ -324,7 +597,7 @@ class QuantumChemistryParser:
                 return {
                     'success': True,
                     'property': property_name,
-                    'value': self._convert_complex_to_json(value),
+                    'value': value,
                     'formatted_output': formatted_output
                 }
             else:
@@ -337,13 +610,21 @@ class QuantumChemistryParser:
             return {
                 'success': False,
                 'error': str(e),
-                'traceback': traceback.format_exc()
+                'traceback': _format_traceback(e)
             }
     
-    def execute_ccwrite(self, file_path: str, output_format: str, output_path: str = None) -> Dict[str, Any]:
+    def execute_ccwrite(self, file_path: str, output_format: str, output_path: Optional[str] = None) -> Dict[str, Any]:
         """Execute ccwrite command equivalent using cclib's ccwrite function"""
+        if not _require_cclib():
+            return {
+                'success': False,
+                'error': 'cclib library not available'
+            }
+        
+        assert ccwrite is not None
+        
         try:
-            data = ccread(file_path)
+            data = _read(file_path)
             
             # Use cclib's ccwrite function for all formats
             if output_path:
@@ -373,56 +654,151 @@ class QuantumChemistryParser:
             }
 
 
-def main():
+def _loads(line: Union[str, bytes]) -> Any:
+    """Decode one JSON document"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _serve_request(handlers: Dict[str, Callable[..., Dict[str, Any]]], line: bytes) -> Dict[str, Any]:
+    """Run one serve request and return its result"""
+    from inspect import signature
+    
+    try:
+        request = _loads(line)
+    except ValueError as e:
+        return {
+            'success': False,
+            'error': f'Invalid request: {e}'
+        }
+    
+    args = request.get('args', []) if isinstance(request, dict) else None
+    if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+        return {
+            'success': False,
+            'error': 'Invalid request: expected an object with "cmd" and a list of string "args"'
+        }
+    
+    command = request.get('cmd')
+    handler = handlers.get(command) if isinstance(command, str) else None
+    if handler is None:
+        return {
+            'success': False,
+            'error': 'Invalid command or arguments'
+        }
+    
+    try:
+        signature(handler).bind(*args)
+    except TypeError as e:
+        return {
+            'success': False,
+            'error': f'Invalid arguments for {command}: {e}'
+        }
+    
+    try:
+        return handler(*args)
+    except Exception as e:
+        # Handlers report their own errors; this only keeps the server alive
+        return {
+            'success': False,
+            'error': str(e),
+            'traceback': _format_traceback(e)
+        }
+
+
+def serve(parser: QuantumChemistryParser, binary: bool = False) -> None:
+    """Answer newline-delimited JSON requests on stdin until it is closed"""
+    handlers: Dict[str, Callable[..., Dict[str, Any]]] = {
+        'parse': parser.parse_file,
+        'ccget': parser.execute_ccget,
+        'ccwrite': parser.execute_ccwrite,
+        'detect': parser.execute_detect
+    }
+    
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        
+        result = _serve_request(handlers, line)
+        
+        # Encode fully before writing so a failure never leaves a partial line
+        try:
+            encoded = _encode_result(result, binary)
+        except Exception as e:
+            encoded = _encode_result({
+                'success': False,
+                'error': f'Failed to encode result: {e}'
+            }, binary)
+        
+        sys.stdout.buffer.write(encoded)
+        sys.stdout.flush()
+
+
+def main() -> None:
     """Main function for command-line interface"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
+    # --binary switches the output of any command to MessagePack
+    binary = '--binary' in sys.argv[1:]
+    argv = [arg for arg in sys.argv if arg != '--binary']
+    
+    if binary and not _require_msgpack():
+        _write_result({
+            'success': False,
+            'error': 'msgpack library not available'
+        })
+        return
+    
+    if len(argv) < 2:
+        _write_result({
             'success': False,
             'error': 'No command specified'
-        }))
+        }, binary)
         return
     
     parser = QuantumChemistryParser()
-    command = sys.argv[1]
+    command = argv[1]
     
-    if command == 'parse' and len(sys.argv) >= 3:
-        file_path = sys.argv[2]
+    if command == 'parse' and len(argv) >= 3:
+        file_path = argv[2]
         result = parser.parse_file(file_path)
-        print(json.dumps(result))
+        _write_result(result, binary)
         
-    elif command == 'ccget' and len(sys.argv) >= 4:
-        file_path = sys.argv[2]
-        property_name = sys.argv[3]
+    elif command == 'ccget' and len(argv) >= 4:
+        file_path = argv[2]
+        property_name = argv[3]
         result = parser.execute_ccget(file_path, property_name)
-        print(json.dumps(result))
+        _write_result(result, binary)
         
-    elif command == 'ccwrite' and len(sys.argv) >= 4:
-        file_path = sys.argv[2]
-        output_format = sys.argv[3]
-        output_path = sys.argv[4] if len(sys.argv) > 4 else None
+    elif command == 'ccwrite' and len(argv) >= 4:
+        file_path = argv[2]
+        output_format = argv[3]
+        output_path = argv[4] if len(argv) > 4 else None
         result = parser.execute_ccwrite(file_path, output_format, output_path)
-        print(json.dumps(result))
+        _write_result(result, binary)
         
-    elif command == 'detect' and len(sys.argv) >= 3:
-        file_path = sys.argv[2]
-        try:
-            data = ccread(file_path)
-            format_type = parser._get_format_from_cclib_data(data)
-            print(json.dumps({
-                'success': True,
-                'detected_format': format_type
-            }))
-        except Exception as e:
-            print(json.dumps({
-                'success': False,
-                'error': str(e)
-            }))
+    elif command == 'parse-many':
+        # One path per line on stdin, one JSON result per line on stdout;
+        # each worker imports cclib once and reuses it for all its files
+        from concurrent.futures import ProcessPoolExecutor
+        paths = [line.strip() for line in sys.stdin if line.strip()]
+        with ProcessPoolExecutor(initializer=_require_cclib) as executor:
+            for path, result in zip(paths, executor.map(parser.parse_file, paths, chunksize=4)):
+                _write_result({'path': path, **result}, binary)
+                sys.stdout.flush()
+        
+    elif command == 'detect' and len(argv) >= 3:
+        file_path = argv[2]
+        result = parser.execute_detect(file_path)
+        _write_result(result, binary)
+        
+    elif command == 'serve':
+        serve(parser, binary)
         
     else:
-        print(json.dumps({
+        _write_result({
             'success': False,
             'error': 'Invalid command or arguments'
-        }))
+        }, binary)
 
 
 if __name__ == '__main__':
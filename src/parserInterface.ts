@@ -2,6 +2,15 @@ import * as cp from 'child_process';
 import * as path from 'path';
 import { PythonManager, EnvironmentStatus } from './pythonManager';
 
+/**
+ * Flattened numeric array; data holds the elements in row-major order
+ */
+export interface FlatArray {
+    shape: number[];
+    dtype: string;
+    data: number[];
+}
+
 /**
  * Molecular data structure
  */
@@ -14,7 +23,7 @@ export interface MolecularData {
         charge: number;
         multiplicity: number;
         atoms: number[];
-        coordinates: number[][];
+        coordinates: FlatArray;
         masses: number[];
     };
     energies?: {
@@ -273,12 +282,17 @@ export class ParserInterface {
             let output = '';
             let errorOutput = '';
 
-            process.stdout?.on('data', (data) => {
-                output += data.toString();
+            // Decode as a UTF-8 stream so multi-byte characters split across
+            // chunks are reassembled instead of turning into U+FFFD
+            process.stdout?.setEncoding('utf8');
+            process.stderr?.setEncoding('utf8');
+
+            process.stdout?.on('data', (data: string) => {
+                output += data;
             });
 
-            process.stderr?.on('data', (data) => {
-                errorOutput += data.toString();
+            process.stderr?.on('data', (data: string) => {
+                errorOutput += data;
             });
 
             process.on('close', (code) => {